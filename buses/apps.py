@@ -5,6 +5,9 @@ class BusesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'buses'
 
+    def ready(self):
+        from . import lookup  # noqa: F401  (registers cache invalidation)
+
 
 ROTOR_POSITIONS_STANDARD = (
     'Front-Left',
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import time
+from contextvars import ContextVar
+from typing import Callable, TypeVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.http import HttpRequest, HttpResponse
+
+# Apps whose reads must always see the primary: the session row that carries
+# the read-your-writes pin itself, and the users, permissions and content
+# types that authentication and admin access checks depend on.
+PRIMARY_ONLY_APPS = frozenset({"sessions", "auth", "contenttypes"})
+
+PIN_SESSION_KEY = "_db_primary_pin_until"
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+_read_alias: ContextVar[str | None] = ContextVar("buses_read_alias", default=None)
+
+ViewFunc = TypeVar("ViewFunc", bound=Callable[..., HttpResponse])
+
+
+def get_replica_alias() -> str | None:
+    alias = getattr(settings, "REPLICA_DATABASE_ALIAS", None)
+    if alias and alias in settings.DATABASES:
+        return alias
+    return None
+
+
+def replica_read(view: ViewFunc) -> ViewFunc:
+    """Mark a view as read-only so its queries may be served by the replica."""
+
+    view.replica_read = True  # type: ignore[attr-defined]
+    return view
+
+
+def replica_pin_exempt(view: ViewFunc) -> ViewFunc:
+    """Skip the read-your-writes pin, e.g. for machine clients without sessions."""
+
+    view.replica_pin_exempt = True  # type: ignore[attr-defined]
+    return view
+
+
+def _is_read_only_view(request: HttpRequest, view_func: Callable) -> bool:
+    if getattr(view_func, "replica_read", False):
+        return True
+    match = request.resolver_match
+    return bool(
+        match
+        and match.namespace == "admin"
+        and (match.url_name or "").endswith("_changelist")
+    )
+
+
+def _is_pinned(request: HttpRequest) -> bool:
+    session = getattr(request, "session", None)
+    if session is None:
+        return False
+    pinned_until = session.get(PIN_SESSION_KEY)
+    return pinned_until is not None and pinned_until > time.time()
+
+
+class PrimaryReplicaRouter:
+    """Send reads to the replica when the current request allows it.
+
+    Writes, migrations and anything outside a read-only view always use the
+    primary; the replica is expected to be a copy of it rather than a schema
+    of its own.
+    """
+
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        if alias and model._meta.app_label not in PRIMARY_ONLY_APPS:
+            return alias
+        return None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaRoutingMiddleware:
+    """Scope replica reads to read-only views and pin sessions after writes.
+
+    A successful unsafe request pins the session to the primary for
+    ``REPLICA_PIN_SECONDS`` so the redirect that follows it, and anything else
+    the user opens shortly after, sees their own changes despite replica lag.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]):
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        token = _read_alias.set(None)
+        try:
+            response = self.get_response(request)
+        finally:
+            _read_alias.reset(token)
+
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and hasattr(request, "session")
+            and not getattr(request, "_replica_pin_exempt", False)
+        ):
+            request.session[PIN_SESSION_KEY] = time.time() + getattr(
+                settings, "REPLICA_PIN_SECONDS", 10
+            )
+        return response
+
+    def process_view(self, request: HttpRequest, view_func, view_args, view_kwargs):
+        if getattr(view_func, "replica_pin_exempt", False):
+            request._replica_pin_exempt = True
+        alias = get_replica_alias()
+        if (
+            alias
+            and request.method in SAFE_METHODS
+            and _is_read_only_view(request, view_func)
+            and not _is_pinned(request)
+        ):
+            _read_alias.set(alias)
+        return None
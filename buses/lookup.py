@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Bus
+
+
+class BusNumberIndex:
+    """In-process map of bus number to id for typeahead and barcode scans.
+
+    The whole fleet is loaded in one query and kept sorted by case-folded
+    bus number, so prefix searches are a bisect rather than a LIKE scan.
+    Saves and deletes in this process invalidate it; other processes pick
+    changes up once ``BUS_LOOKUP_CACHE_SECONDS`` has passed.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._ids: Dict[str, int] = {}
+        self._folded_ids: Dict[str, int] = {}
+        self._sorted: List[Tuple[str, str, int]] = []
+        self._loaded_at: float | None = None
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded_at = None
+
+    def _ensure_loaded(self) -> None:
+        ttl = getattr(settings, "BUS_LOOKUP_CACHE_SECONDS", 60)
+        with self._lock:
+            if self._loaded_at is not None and time.monotonic() - self._loaded_at < ttl:
+                return
+            # Always load from the primary: the index is shared by every
+            # request in the process, so a lagging replica must not seed it.
+            rows = (
+                Bus.objects.using(DEFAULT_DB_ALIAS)
+                .order_by()
+                .values_list("bus_number", "id")
+            )
+            self._ids = dict(rows)
+            self._folded_ids = {
+                bus_number.casefold(): bus_id for bus_number, bus_id in self._ids.items()
+            }
+            self._sorted = sorted(
+                (bus_number.casefold(), bus_number, bus_id)
+                for bus_number, bus_id in self._ids.items()
+            )
+            self._loaded_at = time.monotonic()
+
+    def get_id(self, bus_number: str) -> int | None:
+        """Exact match, falling back to a case-insensitive one.
+
+        A miss is confirmed against the primary, since the bus may have been
+        added by another process since the index was loaded.
+        """
+        self._ensure_loaded()
+        bus_id = self._ids.get(bus_number)
+        if bus_id is None:
+            bus_id = self._folded_ids.get(bus_number.casefold())
+        if bus_id is None:
+            bus_id = (
+                Bus.objects.using(DEFAULT_DB_ALIAS)
+                .filter(bus_number=bus_number)
+                .values_list("id", flat=True)
+                .first()
+            )
+            if bus_id is not None:
+                self.invalidate()
+        return bus_id
+
+    def search(self, prefix: str, limit: int = 10) -> List[Tuple[str, int]]:
+        self._ensure_loaded()
+        folded = prefix.casefold()
+        entries = self._sorted
+        start = bisect.bisect_left(entries, (folded,))
+        matches: List[Tuple[str, int]] = []
+        for key, bus_number, bus_id in entries[start : start + limit]:
+            if not key.startswith(folded):
+                break
+            matches.append((bus_number, bus_id))
+        return matches
+
+
+bus_index = BusNumberIndex()
+
+
+@receiver(post_save, sender=Bus)
+def _invalidate_on_save(sender, instance, created, update_fields, **kwargs):
+    if created or update_fields is None or "bus_number" in update_fields:
+        bus_index.invalidate()
+
+
+@receiver(post_delete, sender=Bus)
+def _invalidate_on_delete(sender, instance, **kwargs):
+    bus_index.invalidate()
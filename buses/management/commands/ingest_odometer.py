@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import csv
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from buses.telematics import OdometerCoalescer, parse_ping
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream telematics odometer pings as CSV lines of "
+        "bus_number,odometer,timestamp and flush them to the database in "
+        "periodic bulk updates."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "source",
+            nargs="?",
+            default="-",
+            help="CSV file to read, or '-' for standard input (default).",
+        )
+        parser.add_argument(
+            "--flush-interval",
+            type=float,
+            default=getattr(settings, "TELEMATICS_FLUSH_SECONDS", 5),
+            help="Seconds between bulk writes.",
+        )
+
+    def handle(self, *args, **options):
+        source = options["source"]
+        stream = sys.stdin if source == "-" else open(source, newline="")
+
+        coalescer = OdometerCoalescer()
+        coalescer.start(options["flush_interval"])
+        accepted = rejected = 0
+        try:
+            for row in csv.reader(stream):
+                if not row or row[0].startswith("#"):
+                    continue
+                try:
+                    ping = parse_ping(
+                        {
+                            "bus_number": row[0],
+                            "odometer": row[1] if len(row) > 1 else None,
+                            "timestamp": row[2] if len(row) > 2 else None,
+                        }
+                    )
+                except ValueError as exc:
+                    rejected += 1
+                    self.stderr.write(f"Skipping line {row!r}: {exc}")
+                    continue
+                coalescer.add(ping)
+                accepted += 1
+        finally:
+            coalescer.stop()
+            if stream is not sys.stdin:
+                stream.close()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Ingested {accepted} pings ({rejected} rejected)."
+            )
+        )
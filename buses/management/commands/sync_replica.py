@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import sqlite3
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from buses.db_routing import get_replica_alias
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the primary SQLite database onto the replica. Stands in for "
+        "real replication when developing locally."
+    )
+
+    def handle(self, *args, **options):
+        alias = get_replica_alias()
+        if alias is None:
+            raise CommandError(
+                "No replica configured; set FLEET_REPLICA_DB to enable one."
+            )
+
+        primary = connections[DEFAULT_DB_ALIAS]
+        replica = connections[alias]
+        if primary.vendor != "sqlite" or replica.vendor != "sqlite":
+            raise CommandError("sync_replica only supports SQLite databases.")
+
+        replica.close()
+        primary.ensure_connection()
+        target = sqlite3.connect(replica.settings_dict["NAME"])
+        try:
+            primary.connection.backup(target)
+        finally:
+            target.close()
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Replica '{alias}' synced from primary.")
+        )
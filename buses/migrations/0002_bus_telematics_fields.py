@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('buses', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bus',
+            name='daily_miles',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='bus',
+            name='odometer_anchor_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='bus',
+            name='odometer_anchor_mileage',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
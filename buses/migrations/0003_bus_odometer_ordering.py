@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('buses', '0002_bus_telematics_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bus',
+            name='odometer_reading_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='bus',
+            name='odometer_suspect_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='bus',
+            name='odometer_suspect_mileage',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -30,6 +30,16 @@ class Bus(models.Model):
     current_mileage = models.PositiveIntegerField()
     is_articulating = models.BooleanField(default=False)
     min_rotor_thickness = models.DecimalField(max_digits=5, decimal_places=2)
+    # Telematics-derived mileage rate and the odometer reading it was last
+    # updated from; see buses.telematics.
+    daily_miles = models.FloatField(null=True, blank=True)
+    odometer_anchor_mileage = models.PositiveIntegerField(null=True, blank=True)
+    odometer_anchor_at = models.DateTimeField(null=True, blank=True)
+    # Timestamp of the newest telematics ping applied, and the start of any
+    # run of pings that disagree with the anchor.
+    odometer_reading_at = models.DateTimeField(null=True, blank=True)
+    odometer_suspect_mileage = models.PositiveIntegerField(null=True, blank=True)
+    odometer_suspect_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         ordering = ["bus_number"]
@@ -6,7 +6,13 @@ from datetime import date
 from decimal import Decimal, ROUND_HALF_UP
 from typing import Dict, List, Sequence
 
-from django.db.models import Prefetch
+from django.db.models import (
+    DecimalField,
+    OuterRef,
+    Prefetch,
+    QuerySet,
+    Subquery,
+)
 from django.utils import timezone
 
 from .apps import ROTOR_POSITIONS_ARTICULATED, ROTOR_POSITIONS_STANDARD
@@ -24,6 +30,53 @@ def get_rotor_positions(bus: Bus) -> Sequence[str]:
     return ROTOR_POSITIONS_ARTICULATED if bus.is_articulating else ROTOR_POSITIONS_STANDARD
 
 
+THICKNESS_QUANTUM = Decimal("0.001")
+
+
+def rotor_field(position: str) -> str:
+    """Identifier-safe form of a rotor position, e.g. ``front_left``."""
+    return position.lower().replace("-", "_").replace(" ", "_")
+
+
+def _last_thickness_field(position: str) -> str:
+    return f"last_{rotor_field(position)}"
+
+
+def with_last_thicknesses(queryset: QuerySet[Bus]) -> QuerySet[Bus]:
+    """Annotate each bus with its latest thickness per rotor position.
+
+    Every position is a correlated subquery on the (bus, position, date)
+    index, so the bus and its last readings load in a single query.
+    """
+    annotations = {}
+    all_positions = dict.fromkeys(
+        ROTOR_POSITIONS_ARTICULATED + ROTOR_POSITIONS_STANDARD
+    )
+    for position in all_positions:
+        latest = (
+            RotorMeasurement.objects.filter(bus=OuterRef("pk"), position=position)
+            .order_by("-measurement_date", "-id")
+            .values("thickness_mm")[:1]
+        )
+        annotations[_last_thickness_field(position)] = Subquery(
+            latest, output_field=DecimalField(max_digits=6, decimal_places=3)
+        )
+    return queryset.annotate(**annotations)
+
+
+def get_last_thicknesses(bus: Bus) -> Dict[str, Decimal]:
+    last_thicknesses: Dict[str, Decimal] = {}
+    for position in get_rotor_positions(bus):
+        thickness = getattr(bus, _last_thickness_field(position), None)
+        if thickness is not None:
+            # Annotated decimals are not quantized on SQLite; match the
+            # model field's three places.
+            last_thicknesses[position] = Decimal(thickness).quantize(
+                THICKNESS_QUANTUM
+            )
+    return last_thicknesses
+
+
 def _compute_daily_miles(measurements: Sequence[RotorMeasurement]) -> float | None:
     if len(measurements) < 2:
         return None
@@ -76,7 +129,7 @@ def _compute_rotor_stats(bus: Bus, measurements: Sequence[RotorMeasurement]) ->
         replacement_mileage = starting_mileage + service_life_miles
         miles_left = max(replacement_mileage - bus.current_mileage, 0)
 
-    daily_miles = _compute_daily_miles(measurements)
+    daily_miles = bus.daily_miles or _compute_daily_miles(measurements)
     days_left = None
     if miles_left is not None and daily_miles:
         days_left = max(int(round(miles_left / daily_miles)), 0)
@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import atexit
+import logging
+import math
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Dict, Iterable, List, Mapping
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Bus
+
+logger = logging.getLogger(__name__)
+
+# Pings only move the daily-mileage rate once they span at least this long,
+# so a bus idling through the night or a burst on the highway does not
+# swing the forecast on its own.
+RATE_MIN_SPAN = timedelta(days=1)
+# Time constant of the exponential average over per-span rates.
+RATE_WINDOW_DAYS = 7.0
+# Miles per day above which a jump from the anchor reading is treated as a
+# bad ping rather than driving.
+MAX_DAILY_MILES = 1000
+# If pings have disagreed with the anchor, but agreed with each other, for
+# this long, the anchor itself is taken to be the bad reading and the bus is
+# re-anchored on them.
+REANCHOR_AFTER = timedelta(days=2)
+# How far ahead of this server's clock a ping timestamp may be.
+MAX_CLOCK_SKEW = timedelta(minutes=5)
+# Largest value Bus.current_mileage can store.
+MAX_ODOMETER = 2_147_483_647
+# Buses looked up per query while flushing.
+FLUSH_BATCH_SIZE = 500
+
+_PING_FIELDS = (
+    "current_mileage",
+    "daily_miles",
+    "odometer_anchor_mileage",
+    "odometer_anchor_at",
+    "odometer_reading_at",
+    "odometer_suspect_mileage",
+    "odometer_suspect_at",
+)
+
+
+@dataclass
+class OdometerPing:
+    bus_number: str
+    odometer: int
+    timestamp: datetime
+
+
+def _parse_finite(value: object) -> float:
+    if isinstance(value, bool):
+        raise ValueError(value)
+    number = float(value)  # type: ignore[arg-type]
+    if not math.isfinite(number):
+        raise ValueError(value)
+    return number
+
+
+def _parse_timestamp(value: object) -> datetime:
+    if value is None or value == "":
+        return timezone.now()
+    parsed = parse_datetime(value) if isinstance(value, str) else None
+    if parsed is None:
+        try:
+            return datetime.fromtimestamp(_parse_finite(value), tz=dt_timezone.utc)
+        except (TypeError, ValueError, OverflowError, OSError):
+            raise ValueError(f"Invalid timestamp {value!r}.") from None
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed, dt_timezone.utc)
+    return parsed
+
+
+def parse_ping(data: Mapping[str, object]) -> OdometerPing:
+    """Validate one ``{bus_number, odometer, timestamp}`` mapping."""
+
+    if not isinstance(data, Mapping):
+        raise ValueError("Each ping must be an object.")
+    bus_number = str(data.get("bus_number") or "").strip()
+    if not bus_number:
+        raise ValueError("Ping is missing bus_number.")
+    try:
+        odometer = int(_parse_finite(data["odometer"]))
+    except (KeyError, TypeError, ValueError, OverflowError):
+        raise ValueError(f"Ping for bus {bus_number} has an invalid odometer.") from None
+    if not 0 <= odometer <= MAX_ODOMETER:
+        raise ValueError(f"Ping for bus {bus_number} has an out-of-range odometer.")
+    timestamp = _parse_timestamp(data.get("timestamp"))
+    if timestamp > timezone.now() + MAX_CLOCK_SKEW:
+        raise ValueError(f"Ping for bus {bus_number} is dated in the future.")
+    return OdometerPing(bus_number=bus_number, odometer=odometer, timestamp=timestamp)
+
+
+def _is_plausible(miles: int, span: timedelta) -> bool:
+    days = span.total_seconds() / 86400
+    return 0 <= miles <= MAX_DAILY_MILES * max(days, 1.0)
+
+
+def _blend_daily_miles(previous: float | None, miles: int, days: float) -> float:
+    sample = miles / days
+    if previous is None or not 0 <= previous <= MAX_DAILY_MILES:
+        return sample
+    alpha = 1 - math.exp(-days / RATE_WINDOW_DAYS)
+    return previous + alpha * (sample - previous)
+
+
+def _set_anchor(bus: Bus, ping: OdometerPing) -> None:
+    bus.odometer_anchor_mileage = ping.odometer
+    bus.odometer_anchor_at = ping.timestamp
+    bus.odometer_suspect_mileage = None
+    bus.odometer_suspect_at = None
+
+
+def _apply_ping(bus: Bus, ping: OdometerPing, now: datetime) -> bool:
+    """Fold one ping into ``bus``; return whether anything changed."""
+    horizon = now + MAX_CLOCK_SKEW
+    if ping.timestamp > horizon:
+        return False
+
+    last_at = bus.odometer_reading_at or bus.odometer_anchor_at
+    if last_at is not None and last_at <= horizon and ping.timestamp <= last_at:
+        return False
+
+    anchor_at = bus.odometer_anchor_at
+    anchor_mileage = bus.odometer_anchor_mileage
+    if anchor_at is None or anchor_mileage is None or anchor_at > horizon:
+        # First ping: start measuring from it, but like add_rotors never let
+        # it lower the mileage already on record.
+        _set_anchor(bus, ping)
+        bus.current_mileage = max(bus.current_mileage, ping.odometer)
+        bus.odometer_reading_at = ping.timestamp
+        return True
+
+    span = ping.timestamp - anchor_at
+    miles = ping.odometer - anchor_mileage
+    if _is_plausible(miles, span):
+        if span >= RATE_MIN_SPAN:
+            bus.daily_miles = _blend_daily_miles(
+                bus.daily_miles, miles, span.total_seconds() / 86400
+            )
+            _set_anchor(bus, ping)
+        bus.odometer_suspect_mileage = None
+        bus.odometer_suspect_at = None
+        bus.current_mileage = max(bus.current_mileage, ping.odometer)
+        bus.odometer_reading_at = ping.timestamp
+        return True
+
+    suspect_at = bus.odometer_suspect_at
+    suspect_mileage = bus.odometer_suspect_mileage
+    if suspect_at is not None and ping.timestamp <= suspect_at:
+        return False
+    agrees = (
+        suspect_at is not None
+        and suspect_mileage is not None
+        and _is_plausible(ping.odometer - suspect_mileage, ping.timestamp - suspect_at)
+    )
+    if not agrees:
+        bus.odometer_suspect_mileage = ping.odometer
+        bus.odometer_suspect_at = ping.timestamp
+        return True
+    if ping.timestamp - suspect_at < REANCHOR_AFTER:
+        return False
+
+    # Consistent readings have contradicted the anchor for REANCHOR_AFTER:
+    # trust them over it, even if that lowers the mileage.
+    _set_anchor(bus, ping)
+    bus.current_mileage = ping.odometer
+    bus.odometer_reading_at = ping.timestamp
+    return True
+
+
+def apply_odometer_pings(pings: Iterable[OdometerPing]) -> List[int]:
+    """Write the latest ping per bus in one bulk update.
+
+    Pings dated in the future or no newer than the last applied reading are
+    dropped, and ordinary pings only ever raise ``current_mileage``. A ping
+    implying more than ``MAX_DAILY_MILES`` from the anchor, or a rolled-back
+    odometer, is held as suspect; only once suspect pings have agreed with
+    each other for ``REANCHOR_AFTER`` does the bus re-anchor on them, which
+    may lower the mileage. Returns the ids of the buses that changed.
+    """
+
+    latest: Dict[str, OdometerPing] = {}
+    for ping in pings:
+        current = latest.get(ping.bus_number)
+        if current is None or ping.timestamp >= current.timestamp:
+            latest[ping.bus_number] = ping
+    if not latest:
+        return []
+
+    bus_numbers = list(latest)
+    changed: List[Bus] = []
+    now = timezone.now()
+    with transaction.atomic():
+        for start in range(0, len(bus_numbers), FLUSH_BATCH_SIZE):
+            buses = Bus.objects.filter(
+                bus_number__in=bus_numbers[start : start + FLUSH_BATCH_SIZE]
+            ).only("id", "bus_number", *_PING_FIELDS)
+            for bus in buses:
+                if _apply_ping(bus, latest[bus.bus_number], now):
+                    changed.append(bus)
+
+        Bus.objects.bulk_update(changed, _PING_FIELDS, batch_size=FLUSH_BATCH_SIZE)
+    return [bus.id for bus in changed]
+
+
+class OdometerCoalescer:
+    """Keep only the newest ping per bus until the next flush.
+
+    Adding a ping is a dictionary write under a lock, so producers never wait
+    on the database; :meth:`flush` swaps the buffer out and writes it with
+    :func:`apply_odometer_pings`.
+    """
+
+    def __init__(self) -> None:
+        self._latest: Dict[str, OdometerPing] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def add(self, ping: OdometerPing) -> None:
+        with self._lock:
+            current = self._latest.get(ping.bus_number)
+            if current is None or ping.timestamp >= current.timestamp:
+                self._latest[ping.bus_number] = ping
+
+    def add_many(self, pings: Iterable[OdometerPing]) -> None:
+        for ping in pings:
+            self.add(ping)
+
+    def flush(self) -> List[int]:
+        with self._lock:
+            pending, self._latest = self._latest, {}
+        try:
+            return apply_odometer_pings(pending.values())
+        except Exception:
+            # Put the batch back so the next flush retries it; anything newer
+            # that arrived meanwhile still wins.
+            for ping in pending.values():
+                self.add(ping)
+            raise
+
+    def start(self, interval: float) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, args=(interval,), name="odometer-flush", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> List[int]:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        return self.flush()
+
+    def _run(self, interval: float) -> None:
+        try:
+            while not self._stopped.wait(interval):
+                try:
+                    self.flush()
+                except Exception:
+                    logger.exception("Failed to flush odometer pings")
+        finally:
+            connections.close_all()
+
+
+_coalescer: OdometerCoalescer | None = None
+_coalescer_lock = threading.Lock()
+
+
+def get_coalescer() -> OdometerCoalescer:
+    """Return the process-wide coalescer, starting its flush thread once."""
+
+    global _coalescer
+    with _coalescer_lock:
+        if _coalescer is None:
+            _coalescer = OdometerCoalescer()
+            _coalescer.start(getattr(settings, "TELEMATICS_FLUSH_SECONDS", 5))
+            atexit.register(_coalescer.stop)
+    return _coalescer
@@ -1,5 +1,7 @@
 from django import template
 
+from ..services import rotor_field
+
 register = template.Library()
 
 
@@ -10,6 +12,4 @@ def get_item(mapping, key):
     return mapping.get(key)
 
 
-@register.filter
-def rotor_field(label: str) -> str:
-    return label.lower().replace("-", "_").replace(" ", "_")
+register.filter("rotor_field", rotor_field)
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .lookup import bus_index
+from .models import Bus
+from .telematics import (
+    REANCHOR_AFTER,
+    OdometerPing,
+    apply_odometer_pings,
+    parse_ping,
+)
+
+
+class ApplyOdometerPingsTests(TestCase):
+    def setUp(self):
+        self.now = timezone.now()
+        self.bus = Bus.objects.create(
+            bus_number="800",
+            bus_type="40ft",
+            location="North",
+            current_mileage=0,
+            min_rotor_thickness=Decimal("30.00"),
+        )
+
+    def ping(self, odometer, ago):
+        apply_odometer_pings([OdometerPing("800", odometer, self.now - ago)])
+        self.bus.refresh_from_db()
+
+    def test_first_ping_never_lowers_recorded_mileage(self):
+        Bus.objects.filter(pk=self.bus.pk).update(current_mileage=50000)
+        self.ping(100, timedelta(hours=1))
+        self.assertEqual(self.bus.current_mileage, 50000)
+        self.assertEqual(self.bus.odometer_anchor_mileage, 100)
+
+    def test_late_ping_is_dropped(self):
+        self.ping(100, timedelta(hours=10))
+        self.ping(300, timedelta(hours=2))
+        self.ping(150, timedelta(hours=8))
+        self.assertEqual(self.bus.current_mileage, 300)
+        self.assertEqual(self.bus.odometer_reading_at, self.now - timedelta(hours=2))
+
+    def test_future_ping_is_dropped(self):
+        self.ping(100, timedelta(hours=1))
+        self.ping(200, -timedelta(days=1))
+        self.assertEqual(self.bus.current_mileage, 100)
+
+    def test_daily_miles_derived_from_pings(self):
+        self.ping(60000, timedelta(days=3))
+        self.ping(60200, timedelta(days=2))
+        self.assertAlmostEqual(self.bus.daily_miles, 200)
+        self.assertEqual(self.bus.odometer_anchor_mileage, 60200)
+
+    def test_implausible_jump_is_held_as_suspect(self):
+        self.ping(60000, timedelta(days=3))
+        self.ping(9_999_999, timedelta(hours=2))
+        self.assertEqual(self.bus.current_mileage, 60000)
+        self.assertEqual(self.bus.odometer_suspect_mileage, 9_999_999)
+
+        self.ping(60300, timedelta(hours=1))
+        self.assertEqual(self.bus.current_mileage, 60300)
+        self.assertIsNone(self.bus.odometer_suspect_at)
+
+    def test_single_rollback_after_long_silence_does_not_reanchor(self):
+        self.ping(60000, timedelta(days=3))
+        self.ping(12, timedelta(hours=1))
+        self.assertEqual(self.bus.current_mileage, 60000)
+        self.assertEqual(self.bus.odometer_anchor_mileage, 60000)
+
+    def test_disagreeing_suspects_do_not_reanchor(self):
+        self.ping(60000, timedelta(days=6))
+        self.ping(12, timedelta(days=4))
+        self.ping(900_000, timedelta(days=1))
+        self.assertEqual(self.bus.current_mileage, 60000)
+        self.assertEqual(self.bus.odometer_suspect_mileage, 900_000)
+
+    def test_consistent_suspects_reanchor_after_window(self):
+        self.ping(9_999_999, timedelta(days=6))
+        self.ping(200_000, timedelta(days=4))
+        self.ping(200_100, timedelta(days=4) - REANCHOR_AFTER / 2)
+        self.assertEqual(self.bus.current_mileage, 9_999_999)
+
+        self.ping(200_300, timedelta(days=1))
+        self.assertEqual(self.bus.current_mileage, 200_300)
+        self.assertEqual(self.bus.odometer_anchor_mileage, 200_300)
+        self.assertIsNone(self.bus.odometer_suspect_at)
+
+
+class ParsePingTests(TestCase):
+    def test_rejects_non_finite_and_overflowing_values(self):
+        for data in (
+            {"bus_number": "800", "odometer": float("inf")},
+            {"bus_number": "800", "odometer": "inf"},
+            {"bus_number": "800", "odometer": 1, "timestamp": 1e20},
+            {"bus_number": "800", "odometer": 1, "timestamp": "1e400"},
+        ):
+            with self.subTest(data=data), self.assertRaises(ValueError):
+                parse_ping(data)
+
+    def test_rejects_future_timestamp(self):
+        with self.assertRaises(ValueError):
+            parse_ping(
+                {"bus_number": "800", "odometer": 1, "timestamp": "2099-01-01T00:00:00Z"}
+            )
+
+
+class BusLookupTests(TestCase):
+    def setUp(self):
+        bus_index.invalidate()
+
+    def test_scan_finds_bus_added_after_index_loaded(self):
+        self.assertEqual(bus_index.search("9"), [])
+        # bulk_create sends no post_save, like a save in another process.
+        Bus.objects.bulk_create(
+            [
+                Bus(
+                    bus_number="901",
+                    bus_type="40ft",
+                    location="North",
+                    current_mileage=0,
+                    min_rotor_thickness=Decimal("30.00"),
+                )
+            ]
+        )
+        response = self.client.get(reverse("bus_lookup"), {"code": "901"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["bus_number"], "901")
+        self.assertEqual(bus_index.search("9")[0][0], "901")
+
+    def test_unknown_code_returns_404(self):
+        response = self.client.get(reverse("bus_lookup"), {"code": "nope"})
+        self.assertEqual(response.status_code, 404)
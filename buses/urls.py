@@ -3,5 +3,7 @@ from django.urls import path
 from . import views
 
 urlpatterns = [
+    path("buses/lookup/", views.bus_lookup, name="bus_lookup"),
     path("buses/<int:bus_id>/add-rotors/", views.add_rotors, name="add_rotors"),
+    path("telematics/odometer/", views.ingest_odometer, name="ingest_odometer"),
 ]
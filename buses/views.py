@@ -1,24 +1,37 @@
 from __future__ import annotations
 
+import hmac
+import json
 from datetime import date
 from decimal import Decimal
 from typing import Dict
 
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
 from django.db.models import Prefetch
-from django.http import HttpRequest, HttpResponse
+from django.http import HttpRequest, HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.utils import timezone
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
 
+from .db_routing import replica_pin_exempt, replica_read
+from .lookup import bus_index
 from .models import Bus, RotorMeasurement
 from .services import (
     build_fleet_snapshot,
+    get_last_thicknesses,
     get_lowest_rotor_summary,
     get_rotor_positions,
     initialize_rotors,
+    rotor_field,
+    with_last_thicknesses,
 )
+from .telematics import get_coalescer, parse_ping
 
 
+@replica_read
 def home(request: HttpRequest) -> HttpResponse:
     buses = (
         Bus.objects.prefetch_related(
@@ -51,6 +64,7 @@ def home(request: HttpRequest) -> HttpResponse:
     )
 
 
+@replica_read
 def maintenance(request: HttpRequest) -> HttpResponse:
     fleet_data = build_fleet_snapshot()
     return render(
@@ -63,18 +77,9 @@ def maintenance(request: HttpRequest) -> HttpResponse:
 
 
 def add_rotors(request: HttpRequest, bus_id: int) -> HttpResponse:
-    bus = get_object_or_404(Bus, pk=bus_id)
+    bus = get_object_or_404(with_last_thicknesses(Bus.objects.all()), pk=bus_id)
     positions = get_rotor_positions(bus)
-
-    last_measurements: Dict[str, Decimal] = {}
-    for position in positions:
-        measurement = (
-            bus.rotor_measurements.filter(position=position)
-            .order_by("-measurement_date", "-id")
-            .first()
-        )
-        if measurement:
-            last_measurements[position] = measurement.thickness_mm
+    last_measurements: Dict[str, Decimal] = get_last_thicknesses(bus)
 
     if request.method == "POST":
         measurement_date_raw = request.POST.get("measurement_date")
@@ -90,7 +95,7 @@ def add_rotors(request: HttpRequest, bus_id: int) -> HttpResponse:
 
         created = False
         for position in positions:
-            field_name = f"thickness_{position.lower().replace('-', '_').replace(' ', '_')}"
+            field_name = f"thickness_{rotor_field(position)}"
             thickness_value = request.POST.get(field_name)
             if not thickness_value:
                 continue
@@ -119,6 +124,61 @@ def add_rotors(request: HttpRequest, bus_id: int) -> HttpResponse:
     )
 
 
+@replica_read
+def bus_lookup(request: HttpRequest) -> HttpResponse:
+    """Typeahead (``?q=`` prefix) and barcode/QR scan (``?code=``) by bus number.
+
+    Typeahead is answered from the in-process index alone; a scan adds one
+    query for the bus and its last thickness per position.
+    """
+    code = request.GET.get("code", "").strip()
+    if code:
+        bus_id = bus_index.get_id(code)
+        bus = None
+        if bus_id is not None:
+            buses = with_last_thicknesses(Bus.objects.all()).filter(pk=bus_id)
+            # The index is loaded from the primary; a bus it knows about may
+            # not have reached the replica yet.
+            bus = buses.first() or buses.using(DEFAULT_DB_ALIAS).first()
+        if bus is None:
+            return JsonResponse({"error": f"No bus numbered {code}."}, status=404)
+
+        last_thicknesses = get_last_thicknesses(bus)
+        return JsonResponse(
+            {
+                "id": bus.id,
+                "bus_number": bus.bus_number,
+                "bus_type": bus.bus_type,
+                "location": bus.location,
+                "current_mileage": bus.current_mileage,
+                "entry_url": reverse("add_rotors", args=[bus.id]),
+                "positions": [
+                    {
+                        "position": position,
+                        "field": f"thickness_{rotor_field(position)}",
+                        "last_thickness": last_thicknesses.get(position),
+                    }
+                    for position in get_rotor_positions(bus)
+                ],
+            }
+        )
+
+    query = request.GET.get("q", "").strip()
+    results = bus_index.search(query) if query else []
+    return JsonResponse(
+        {
+            "results": [
+                {
+                    "id": bus_id,
+                    "bus_number": bus_number,
+                    "entry_url": reverse("add_rotors", args=[bus_id]),
+                }
+                for bus_number, bus_id in results
+            ]
+        }
+    )
+
+
 def new_rotors_view(request: HttpRequest) -> HttpResponse:
     if request.method != "POST":
         return redirect("maintenance")
@@ -127,3 +187,40 @@ def new_rotors_view(request: HttpRequest) -> HttpResponse:
     bus = get_object_or_404(Bus, pk=bus_id)
     initialize_rotors(bus)
     return redirect(reverse("maintenance") + f"#bus-{bus.id}")
+
+
+@csrf_exempt
+@replica_pin_exempt
+@require_POST
+def ingest_odometer(request: HttpRequest) -> HttpResponse:
+    """Accept one odometer ping or a JSON list of them.
+
+    Pings are coalesced in memory and written by the background flush, so
+    the response only confirms they were queued. Clients authenticate with
+    ``TELEMATICS_API_TOKEN`` in the ``X-Telematics-Token`` header; with no
+    token configured the endpoint refuses every request.
+    """
+    expected_token = getattr(settings, "TELEMATICS_API_TOKEN", None)
+    supplied_token = request.headers.get("X-Telematics-Token", "")
+    if not expected_token or not hmac.compare_digest(
+        supplied_token.encode(), expected_token.encode()
+    ):
+        return JsonResponse({"error": "Invalid telematics token."}, status=403)
+    if request.content_type != "application/json":
+        return JsonResponse(
+            {"error": "Content-Type must be application/json."}, status=415
+        )
+
+    try:
+        payload = json.loads(request.body)
+    except ValueError:
+        return JsonResponse({"error": "Request body must be JSON."}, status=400)
+
+    items = payload if isinstance(payload, list) else [payload]
+    try:
+        pings = [parse_ping(item) for item in items]
+    except ValueError as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
+
+    get_coalescer().add_many(pings)
+    return JsonResponse({"accepted": len(pings)}, status=202)
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -46,6 +47,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'buses.db_routing.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -79,9 +81,43 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # WAL lets board reads proceed while telematics flushes write, and
+        # IMMEDIATE transactions take the write lock up front instead of
+        # failing to upgrade a read lock mid-transaction.
+        'OPTIONS': {
+            'init_command': 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;',
+            'transaction_mode': 'IMMEDIATE',
+        },
     }
 }
 
+# Optional read replica for board and report traffic. Set FLEET_REPLICA_DB to
+# a second SQLite file and run `manage.py sync_replica` to refresh it from the
+# primary; leave it unset to serve every request from the primary.
+REPLICA_DATABASE_ALIAS = None
+if os.environ.get('FLEET_REPLICA_DB'):
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ['FLEET_REPLICA_DB'],
+        'TEST': {'MIRROR': 'default'},
+    }
+    REPLICA_DATABASE_ALIAS = 'replica'
+
+# Seconds a session keeps reading from the primary after it writes.
+REPLICA_PIN_SECONDS = 10
+
+DATABASE_ROUTERS = ['buses.db_routing.PrimaryReplicaRouter']
+
+# Seconds between bulk writes of coalesced telematics odometer pings.
+TELEMATICS_FLUSH_SECONDS = 5
+
+# Shared secret telematics clients send in the X-Telematics-Token header. The
+# ingestion endpoint rejects every request while it is unset.
+TELEMATICS_API_TOKEN = os.environ.get('FLEET_TELEMATICS_TOKEN')
+
+# Seconds the in-process bus number index may serve before reloading.
+BUS_LOOKUP_CACHE_SECONDS = 60
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators